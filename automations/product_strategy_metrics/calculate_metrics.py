@@ -3,6 +3,10 @@ import json
 import argparse
 from dataclasses import dataclass
 
+# Regex to split an issue body into sections based on H3 headers, compiled
+# once since parse_sections runs per record
+_SECTION_RE = re.compile(r"###\s*(.+)\n")
+
 
 @dataclass
 class SectionAnalysis:
@@ -23,10 +27,10 @@ class IssueRecord:
 def parse_sections(body: str) -> dict[str, str]:
     """Parse issue body into a dictionary that maps headings to sub-content."""
 
-    # Regex to split the body into sections based on H3 headers
+    # Split the body into sections based on H3 headers
     # Example body: `Ignored\n### Greeting\nHello world ### Goodbye\n\n Goodbye world`
     # Example sections: ["Ignored", "Greeting", "Hello world", "Goodbye", "Goodbye world"]
-    sections = re.split(r"###\s*(.+)\n", body)
+    sections = _SECTION_RE.split(body)
 
     # Create a dictionary of sections
     parsed_sections = {}
@@ -44,19 +48,22 @@ def parse_sections(body: str) -> dict[str, str]:
 def analyze_sections(
     sections: dict[str, str],
     required_sections: list[str],
+    required_set: set[str],
 ) -> SectionAnalysis:
-    """Calculate the percentage of required sections that are filled out."""
-    filled = []
-    missing = []
-    for section in required_sections:
-        # Only consider a section complete if it has more than 20 characters
-        # or if it explicitly uses "N/A"
-        if section in sections and (
-            len(sections[section]) > 20 or sections[section] == "N/A"
-        ):
-            filled.append(section)
-        else:
-            missing.append(section)
+    """Calculate the percentage of required sections that are filled out.
+
+    The caller passes `required_set` (the required sections as a set, built
+    once) so membership checks don't re-hash the list on every record.
+    """
+    # Only consider a section complete if it has more than 20 characters
+    # or if it explicitly uses "N/A"
+    present = {
+        title
+        for title, content in sections.items()
+        if title in required_set and (len(content) > 20 or content == "N/A")
+    }
+    filled = [section for section in required_sections if section in present]
+    missing = [section for section in required_sections if section not in present]
     percent_filled = (len(filled) / len(required_sections)) * 100
     return SectionAnalysis(percent_filled, filled, missing)
 
@@ -77,12 +84,15 @@ def main():
     with open(args.input_file, "r") as file:
         data = json.load(file)
 
+    # Build the required-section set once, outside the record loop
+    required_set = set(args.required_sections)
+
     # Process each record
     for item in data:
         record = IssueRecord(**item)
 
         sections = parse_sections(record.body)
-        analysis = analyze_sections(sections, args.required_sections)
+        analysis = analyze_sections(sections, args.required_sections, required_set)
 
         # Output results
         print(f"### {record.title}")
@@ -1,23 +1,29 @@
 """Loads exported DAT and XML files fetched from Grants.gov."""
 
 import logging
+import re
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Union
 import pandas as pd
 
+from forms_analysis.metadata import resolve_metadata
+
+# Whitespace runs to collapse into underscores in column names
+_WS_RE = re.compile(r"\s+")
+
 
 def standardize_col_names(df: pd.DataFrame) -> pd.DataFrame:
     """
     Casts column names to snake_case and strips whitespace.
     """
-    df.columns = df.columns.str.lower().str.strip()
-    df.columns = df.columns.str.replace(r"\s+", "_", regex=True)
+    # One pass over the column names instead of three pandas Index copies
+    df.columns = [_WS_RE.sub("_", col.strip().lower()) for col in df.columns]
     return df
 
 
 def add_form_metadata(
     df: pd.DataFrame,
-    metadata_path: str,
+    metadata: Union[str, pd.DataFrame],
     link_column: str,
 ) -> pd.DataFrame:
     """
@@ -25,46 +31,23 @@ def add_form_metadata(
 
     Args:
         df (pd.DataFrame): DataFrame to enrich
-        metadata_path (str): Path to the metadata CSV file
+        metadata (Union[str, pd.DataFrame]): Path to the metadata CSV file,
+            or an already-loaded frame from metadata.load_metadata
         link_column (str): Column name to use for merging with metadata
 
     Returns:
         pd.DataFrame: DataFrame with form metadata added
     """
-    # Read the metadata CSV file
-    metadata_cols = {
-        "Form Schema": "form_schema_url",
-        "Form DAT": "form_dat_url",
-        "Form Family": "form_family",
-        "Form Name": "form_name",
-        "OMB Number": "form_omb_number",
-        "Agency Owner": "form_agency_owner",
-    }
-
-    # Format metadata
-    metadata_df = pd.read_csv(metadata_path)
-    metadata_df = metadata_df[metadata_cols.keys()]
-    metadata_df.rename(columns=metadata_cols, inplace=True)
-
-    # Drop duplicates based on the specific link column we're using
-    metadata_df.drop_duplicates(subset=[link_column], inplace=True)
-
-    # Merge metadata with data
-    merged_df = pd.merge(
-        df,
-        metadata_df,
-        left_on="form_link",
-        right_on=link_column,
-        how="left",
-    )
-
-    return merged_df
+    # Resolve the metadata table (cached per process when given a path) and
+    # join it against the indexed link column
+    metadata_df = resolve_metadata(metadata, link_column=link_column)
+    return df.join(metadata_df, on="form_link", how="left")
 
 
 def process_all_files(
     file_dir: str,
     file_type: str,
-    metadata_path: str,
+    metadata: Union[str, pd.DataFrame],
     output_path: str,
     process_func: Callable,
 ) -> None:
@@ -74,7 +57,8 @@ def process_all_files(
     Args:
         file_dir (str): Directory containing files
         file_type (str): Type of files to process ("dat" or "xml")
-        metadata_path (str): Path to FormMetadata.csv
+        metadata (Union[str, pd.DataFrame]): Path to FormMetadata.csv, or an
+            already-loaded frame from metadata.load_metadata
         output_path (str): Path to save the output CSV
         process_func (callable): Function to process individual files
     """
@@ -101,12 +85,15 @@ def process_all_files(
         logging.warning(f"No {file_type} files were successfully processed")
         return
 
-    combined_df = pd.concat(dfs, ignore_index=True)
+    # copy=False avoids an extra pass copying every per-file block, since the
+    # inputs are exclusively owned by this list
+    combined_df = pd.concat(dfs, ignore_index=True, copy=False)
+    del dfs  # let the per-file blocks be freed while we enrich and save
 
     # Enrich with metadata
     combined_df = add_form_metadata(
         combined_df,
-        metadata_path,
+        metadata,
         link_column="form_schema_url",
     )
 
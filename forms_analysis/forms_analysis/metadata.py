@@ -0,0 +1,78 @@
+"""Shared loading and caching of the FormMetadata.csv reference table."""
+
+from functools import lru_cache
+from typing import Union
+
+import pandas as pd
+
+# Mapping from FormMetadata.csv column names to the snake_case names used
+# throughout the pipeline
+METADATA_COLS = {
+    "Form Schema": "form_schema_url",
+    "Form DAT": "form_dat_url",
+    "Form Family": "form_family",
+    "Form Name": "form_name",
+    "OMB Number": "form_omb_number",
+    "Agency Owner": "form_agency_owner",
+}
+
+
+@lru_cache(maxsize=None)
+def load_metadata(metadata_path: str, link_column: str) -> pd.DataFrame:
+    """
+    Load FormMetadata.csv renamed, deduplicated, and indexed by a link column.
+
+    Results are cached per (metadata_path, link_column), so the file is
+    parsed at most once per process no matter how many pipeline steps enrich
+    their output with it. Callers should treat the returned frame as
+    read-only.
+
+    Args:
+        metadata_path (str): Path to the metadata CSV file
+        link_column (str): Renamed URL column to deduplicate on and index by
+            (either "form_schema_url" or "form_dat_url")
+
+    Returns:
+        pd.DataFrame: Metadata indexed by the link column, ready to join
+    """
+    # Only parse the columns we keep; usecols returns them in file order, so
+    # reselect (cheap on already-loaded columns) to fix the output order.
+    # The pyarrow engine parses in parallel and keeps strings Arrow-backed,
+    # which also makes the dedup and later joins hash interned strings.
+    metadata_df = pd.read_csv(
+        metadata_path,
+        usecols=list(METADATA_COLS.keys()),
+        engine="pyarrow",
+        dtype_backend="pyarrow",
+    )
+    metadata_df = metadata_df[METADATA_COLS.keys()]
+    metadata_df = metadata_df.rename(columns=METADATA_COLS)
+
+    # Drop duplicates based on the specific link column we're indexing by
+    metadata_df = metadata_df.drop_duplicates(subset=[link_column])
+
+    return metadata_df.set_index(link_column)
+
+
+def resolve_metadata(
+    metadata: Union[str, pd.DataFrame],
+    link_column: str,
+) -> pd.DataFrame:
+    """
+    Return an indexed metadata frame from either a path or a preloaded frame.
+
+    Lets pipeline entry points accept the already-loaded table directly, so
+    chained steps can share one frame instead of each resolving its own.
+
+    Args:
+        metadata (Union[str, pd.DataFrame]): Path to the metadata CSV file,
+            or a frame previously returned by load_metadata
+        link_column (str): Renamed URL column to deduplicate on and index by,
+            used only when metadata is a path
+
+    Returns:
+        pd.DataFrame: Metadata indexed by the link column, ready to join
+    """
+    if isinstance(metadata, pd.DataFrame):
+        return metadata
+    return load_metadata(metadata, link_column)
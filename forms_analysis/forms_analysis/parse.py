@@ -1,14 +1,91 @@
 import pandas as pd
-import xml.etree.ElementTree as ET
+from lxml import etree as ET
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Optional, Union
+
+from forms_analysis.metadata import resolve_metadata
 
 # XML Schema namespace
 XSD_NAMESPACE = "{http://www.w3.org/2001/XMLSchema}"
 
+# Tags checked while walking an element, in Clark notation, built once at
+# import instead of re-formatted on every element visited
+_XSD_ELEMENT_TAG = f"{XSD_NAMESPACE}element"
+_XSD_ANNOTATION_TAG = f"{XSD_NAMESPACE}annotation"
+_XSD_SIMPLE_TYPE_TAG = f"{XSD_NAMESPACE}simpleType"
+_XSD_COMPLEX_TYPE_TAG = f"{XSD_NAMESPACE}complexType"
+_XSD_SEQUENCE_TAG = f"{XSD_NAMESPACE}sequence"
+_XSD_RESTRICTION_TAG = f"{XSD_NAMESPACE}restriction"
+_XSD_DOCUMENTATION_PATH = f"./{XSD_NAMESPACE}documentation"
+
+
+def _empty_columns() -> dict:
+    """
+    Return a fresh dict-of-lists accumulator for parsed element information.
+
+    One list per output column; pandas ingests this layout directly without
+    re-keying a dict per row.
+    """
+    return {
+        "name": [],
+        "path": [],
+        "type_source": [],
+        "type": [],
+        "required": [],
+        "min_occurrences": [],
+        "max_occurrences": [],
+        "description": [],
+        "order": [],
+        "depth": [],
+    }
+
+
+def _load_root_element(xml_path: str) -> Optional[ET._Element]:
+    """
+    Stream-parse a schema file and return the first named element declaration.
+
+    Uses iterparse so that content before the root element is discarded as
+    soon as it has been read, and parsing stops as soon as the root element's
+    subtree is complete. Memory is bounded by the root element's subtree
+    rather than the whole document, and trailing type definitions are never
+    materialized.
+
+    Args:
+        xml_path (str): Path to the XML schema file
+
+    Returns:
+        Optional[ET._Element]: The first xs:element with a name attribute,
+            with its subtree fully built, or None if the schema has none
+    """
+    root_element = None
+    for event, elem in ET.iterparse(xml_path, events=("start", "end")):
+        if event == "start":
+            if (
+                root_element is None
+                and elem.tag == _XSD_ELEMENT_TAG
+                and elem.get("name") is not None
+            ):
+                root_element = elem
+        elif root_element is None:
+            # A fully-parsed subtree that precedes the root element: prune it
+            # so the working set stays small while scanning for the root
+            elem.clear(keep_tail=True)
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+        elif elem is root_element:
+            # The root element's subtree is complete; no need to parse the
+            # rest of the document
+            break
+
+    return root_element
+
 
 def process_element(
-    element: ET.Element,
-    columns: list,
+    element: ET._Element,
+    columns: dict,
     order_counter: int,
     current_path: str = "",
     depth: int = 0,
@@ -17,8 +94,8 @@ def process_element(
     Recursively process XML elements and their children, collecting information about each element.
 
     Args:
-        element (ET.Element): The XML element to process
-        columns (list): List to store column information
+        element (ET._Element): The XML element to process
+        columns (dict): Dict of per-column value lists (see _empty_columns)
         order_counter (int): Counter for element order
         current_path (str): Current path in dot notation
         depth (int): Current depth in the element hierarchy
@@ -26,77 +103,106 @@ def process_element(
     Returns:
         int: Updated order counter
     """
+    # Bind the attribute getter once; it is consulted several times below
+    eget = element.get
+
     # Skip elements without a name attribute
-    if element.get("name") is None:
+    element_name = eget("name")
+    if element_name is None:
         return order_counter
 
     # Build the current path
-    element_name = element.get("name")
     full_path = f"{current_path}.{element_name}" if current_path else element_name
 
-    # Get element information
-    column_info = {
-        "name": element_name,
-        "path": full_path,
-        "type_source": "",
-        "type": "",
-        "required": element.get("minOccurs", "1") != "0",
-        "min_occurrences": element.get("minOccurs", "1"),
-        "max_occurrences": element.get("maxOccurs", "1"),
-        "description": "",
-        "order": order_counter,
-        "depth": depth,
-    }
+    # Single pass over this element's direct children, dispatching by tag;
+    # this replaces several separate find/findall tree walks per element
+    annotation = None
+    simple_type = None
+    complex_type = None
+    for child in element:
+        tag = child.tag
+        if tag == _XSD_ANNOTATION_TAG:
+            if annotation is None:
+                annotation = child
+        elif tag == _XSD_SIMPLE_TYPE_TAG:
+            if simple_type is None:
+                simple_type = child
+        elif tag == _XSD_COMPLEX_TYPE_TAG:
+            if complex_type is None:
+                complex_type = child
 
     # Handle type information
-    type_value = element.get("type", "")
+    type_source = ""
+    element_type = ""
+    type_value = eget("type", "")
     if type_value:
         # Split on colon to separate prefix and type name
         parts = type_value.split(":")
         if len(parts) == 2:
-            column_info["type_source"] = parts[0]
-            column_info["type"] = parts[1]
+            type_source = parts[0]
+            element_type = parts[1]
         else:
-            column_info["type"] = type_value
-    else:
+            element_type = type_value
+    elif simple_type is not None:
         # Check for simpleType with restriction
-        simple_type = element.find(f"./{XSD_NAMESPACE}simpleType")
-        if simple_type is not None:
-            restriction = simple_type.find(f"./{XSD_NAMESPACE}restriction")
-            if restriction is not None:
-                base_type = restriction.get("base", "")
-                if base_type:
-                    parts = base_type.split(":")
-                    if len(parts) == 2:
-                        column_info["type_source"] = parts[0]
-                        column_info["type"] = "restriction"
-                    else:
-                        column_info["type"] = "restriction"
-
-    # Increment order counter
-    order_counter += 1
-
-    # Get description from annotation if available
-    annotation = element.find(f".//{XSD_NAMESPACE}annotation")
+        restriction = None
+        for child in simple_type:
+            if child.tag == _XSD_RESTRICTION_TAG:
+                restriction = child
+                break
+        if restriction is not None:
+            base_type = restriction.get("base", "")
+            if base_type:
+                parts = base_type.split(":")
+                if len(parts) == 2:
+                    type_source = parts[0]
+                    element_type = "restriction"
+                else:
+                    element_type = "restriction"
+
+    # Get description from annotation if available (the annotation is always
+    # a direct child, so no descendant-axis search is needed)
+    description = ""
     if annotation is not None:
-        documentation = annotation.find(f".//{XSD_NAMESPACE}documentation")
+        documentation = annotation.find(_XSD_DOCUMENTATION_PATH)
         if documentation is not None:
-            column_info["description"] = documentation.text.strip()
+            description = documentation.text.strip()
+
+    # Record this element, one value per output column; remember its row so
+    # the type can be rewritten below if this turns out to be a section
+    min_occurs = eget("minOccurs", "1")
+    row_index = len(columns["type"])
+    columns["name"].append(element_name)
+    columns["path"].append(full_path)
+    columns["type_source"].append(type_source)
+    columns["type"].append(element_type)
+    columns["required"].append(min_occurs != "0")
+    columns["min_occurrences"].append(min_occurs)
+    columns["max_occurrences"].append(eget("maxOccurs", "1"))
+    columns["description"].append(description)
+    columns["order"].append(order_counter)
+    columns["depth"].append(depth)
 
-    columns.append(column_info)
+    # Increment order counter
+    order_counter += 1
 
-    # Find the complexType if it exists
-    complex_type = element.find(f"./{XSD_NAMESPACE}complexType")
+    # Find direct child elements within the complexType's sequence
     if complex_type is not None:
-        # Find direct child elements within the sequence
-        sequence = complex_type.find(f"./{XSD_NAMESPACE}sequence")
+        sequence = None
+        for child in complex_type:
+            if child.tag == _XSD_SEQUENCE_TAG:
+                sequence = child
+                break
         if sequence is not None:
             # If this element has a complexType with a sequence containing elements,
             # it's a section
-            if sequence.findall(f"./{XSD_NAMESPACE}element"):
-                column_info["type"] = "FieldSet"
+            child_elements = [
+                child for child in sequence if child.tag == _XSD_ELEMENT_TAG
+            ]
+            if child_elements:
+                columns["type"][row_index] = "FieldSet"
 
-            for child in sequence.findall(f"./{XSD_NAMESPACE}element"):
+            for child in child_elements:
                 order_counter = process_element(
                     child, columns, order_counter, full_path, depth + 1
                 )
@@ -124,65 +230,94 @@ def parse_schema(xml_path: str) -> pd.DataFrame:
             - order: The order in which the element appears in the schema
             - depth: How many levels deep the element is in the hierarchy (0 for root)
     """
-    # Parse the XML file
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
-
-    # Find the root element (first element with a name attribute)
-    root_element = root.find(f".//{XSD_NAMESPACE}element[@name]")
+    # Stream-parse the file up to the root element (first element with a
+    # name attribute); everything outside its subtree is discarded
+    root_element = _load_root_element(xml_path)
     if root_element is None:
         raise ValueError("No root element found in schema")
 
-    # Initialize list to store column information
-    columns = []
+    # Initialize per-column lists to store element information
+    columns = _empty_columns()
     order_counter = 0
 
     # Start processing from the root element
     process_element(root_element, columns, order_counter)
 
-    # Create DataFrame
+    # Create DataFrame directly from the dict of lists; rows are emitted in
+    # traversal order, so they are already sorted by the order column
     df = pd.DataFrame(columns)
 
-    # Sort by order to preserve original sequence
-    df = df.sort_values("order")
-
     return df
 
 
-def add_form_metadata(df: pd.DataFrame, metadata_path: str) -> pd.DataFrame:
+def add_form_metadata(
+    df: pd.DataFrame,
+    metadata: Union[str, pd.DataFrame],
+) -> pd.DataFrame:
     """
     Add form metadata to the parsed schema DataFrame.
 
     Args:
         df (pd.DataFrame): Parsed schema DataFrame
-        metadata_path (str): Path to the metadata CSV file
+        metadata (Union[str, pd.DataFrame]): Path to the metadata CSV file,
+            or an already-loaded frame from metadata.load_metadata
 
     Returns:
         pd.DataFrame: DataFrame with form metadata added
     """
-    # Read the metadata CSV file
-    metadata_cols = {
-        "Form Schema": "form_link",
-        "Form Family": "form_family",
-        "Form Name": "form_name",
-        "OMB Number": "form_omb_number",
-        "Agency Owner": "form_agency_owner",
-    }
-    metadata_df = pd.read_csv(metadata_path)
-    metadata_df = metadata_df[metadata_cols.keys()]
-    metadata_df.rename(columns=metadata_cols, inplace=True)
-    metadata_df.drop_duplicates(subset=["form_link"], inplace=True)
-    merged_df = pd.merge(df, metadata_df, on="form_link", how="left")
+    # Resolve the metadata table (cached per process when given a path) and
+    # join it against the indexed link column
+    metadata_df = resolve_metadata(metadata, link_column="form_schema_url")
+    return df.join(metadata_df, on="form_link", how="left")
+
+
+def _parse_one(schema_file_path: str) -> Optional[pd.DataFrame]:
+    """
+    Parse a single schema file and enrich it with file-derived columns.
+
+    Defined at module level so it can be pickled into worker processes.
+
+    Args:
+        schema_file_path (str): Path to the XML schema file
+
+    Returns:
+        Optional[pd.DataFrame]: Parsed schema DataFrame, or None if parsing failed
+    """
+    schema_file = Path(schema_file_path)
+    try:
+        # Parse the schema
+        df = parse_schema(str(schema_file))
+
+        # Add source file information
+        df["source_file"] = schema_file.name
+
+        # Add form name (extracted from filename)
+        form_name = schema_file.name.split("-")[0]
+        df["form_name_xml"] = form_name
+
+        # Add form link
+        base_url = "https://apply07.grants.gov/apply/forms/schemas/"
+        schema_name = schema_file.name.replace(".xml", "")
+        df["form_link"] = base_url + schema_name
+
+        return df
 
-    return merged_df
+    except Exception as e:
+        print(f"Error processing {schema_file.name}: {str(e)}")
+        return None
 
 
-def parse_all_schemas(schemas_dir: str, metadata_path: str) -> pd.DataFrame:
+def parse_all_schemas(
+    schemas_dir: str,
+    metadata: Union[str, pd.DataFrame],
+) -> pd.DataFrame:
     """
     Parse all XML schemas in a directory and combine them into a single DataFrame.
 
     Args:
         schemas_dir (str): Path to directory containing XML schema files
+        metadata (Union[str, pd.DataFrame]): Path to the metadata CSV file,
+            or an already-loaded frame from metadata.load_metadata
 
     Returns:
         pd.DataFrame: Combined DataFrame with all schema elements, including:
@@ -196,40 +331,26 @@ def parse_all_schemas(schemas_dir: str, metadata_path: str) -> pd.DataFrame:
     if not schema_files:
         raise ValueError(f"No XML files found in {schemas_dir}")
 
-    # Initialize list to store all DataFrames
-    all_dfs = []
-
-    # Process each schema file
-    for schema_file in schema_files:
-        try:
-            # Parse the schema
-            df = parse_schema(str(schema_file))
-
-            # Add source file information
-            df["source_file"] = schema_file.name
-
-            # Add form name (extracted from filename)
-            form_name = schema_file.name.split("-")[0]
-            df["form_name_xml"] = form_name
-
-            # Add form link
-            base_url = "https://apply07.grants.gov/apply/forms/schemas/"
-            schema_name = schema_file.name.replace(".xml", "")
-            df["form_link"] = base_url + schema_name
-
-            all_dfs.append(df)
-
-        except Exception as e:
-            print(f"Error processing {schema_file.name}: {str(e)}")
+    # Parse schema files in parallel; each file is an independent CPU-bound
+    # parse, so this scales with available cores
+    with ProcessPoolExecutor() as executor:
+        all_dfs = [
+            df
+            for df in executor.map(_parse_one, [str(p) for p in schema_files])
+            if df is not None
+        ]
 
     # Combine all DataFrames
     if not all_dfs:
         raise ValueError("No schemas were successfully parsed")
 
-    # Combine all DataFrames, add form metadata, and sort by form name and order
-    combined_df = pd.concat(all_dfs, ignore_index=True)
-    combined_df = add_form_metadata(combined_df, metadata_path)
-    combined_df = combined_df.sort_values(["form_name", "order"])
+    # Combine all DataFrames, add form metadata, and sort by form name; each
+    # per-file block is already ordered by the order column, so a stable
+    # single-key sort keeps rows ordered within each form
+    combined_df = pd.concat(all_dfs, ignore_index=True, copy=False)
+    del all_dfs  # let the per-file blocks be freed while we enrich and sort
+    combined_df = add_form_metadata(combined_df, metadata)
+    combined_df = combined_df.sort_values("form_name", kind="stable")
 
     return combined_df
 
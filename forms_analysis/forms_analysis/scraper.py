@@ -1,15 +1,23 @@
 import logging
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Union
 import pandas as pd
 
+from forms_analysis.metadata import resolve_metadata
+
+# Whitespace runs to collapse into underscores in column names
+_WS_RE = re.compile(r"\s+")
+
 
 def standardize_col_names(df: pd.DataFrame) -> pd.DataFrame:
     """
     Casts column names to PascalCase and strips whitespace.
     """
-    df.columns = df.columns.str.lower().str.strip()
-    df.columns = df.columns.str.replace(r"\s+", "_", regex=True)
+    # One pass over the column names instead of three pandas Index copies
+    df.columns = [_WS_RE.sub("_", col.strip().lower()) for col in df.columns]
     return df
 
 
@@ -61,60 +69,60 @@ def process_all_dat_files(dat_dir: str) -> pd.DataFrame:
         logging.warning(f"No DAT files found in {dat_dir}")
         return pd.DataFrame()
 
-    # Process each file
-    dfs = []
-    for file_path in dat_files:
-        logging.info(f"Processing {file_path}")
-        df = process_dat_file(str(file_path))
-        if not df.empty:
-            dfs.append(df)
+    # Process files in parallel; Excel parsing is CPU-bound in xlrd, so the
+    # per-file work scales across cores
+    logging.info(f"Processing {len(dat_files)} DAT files from {dat_dir}")
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        dfs = [
+            df
+            for df in executor.map(process_dat_file, [str(p) for p in dat_files])
+            if not df.empty
+        ]
 
     # Combine all DataFrames
     if not dfs:
         logging.warning("No DAT files were successfully processed")
         return pd.DataFrame()
 
-    combined_df = pd.concat(dfs, ignore_index=True)
+    # copy=False avoids an extra pass copying every per-file block, since the
+    # inputs are exclusively owned by this list
+    combined_df = pd.concat(dfs, ignore_index=True, copy=False)
     return combined_df
 
 
-def add_form_metadata(df: pd.DataFrame, metadata_path: str) -> pd.DataFrame:
+def add_form_metadata(
+    df: pd.DataFrame,
+    metadata: Union[str, pd.DataFrame],
+) -> pd.DataFrame:
     """
     Add form metadata to the parsed schema DataFrame.
 
     Args:
         df (pd.DataFrame): Parsed schema DataFrame
-        metadata_path (str): Path to the metadata CSV file
+        metadata (Union[str, pd.DataFrame]): Path to the metadata CSV file,
+            or an already-loaded frame from metadata.load_metadata
 
     Returns:
         pd.DataFrame: DataFrame with form metadata added
     """
-    # Read the metadata CSV file
-    metadata_cols = {
-        "Form DAT": "form_link",
-        "Form Family": "form_family",
-        "Form Name": "form_name",
-        "OMB Number": "form_omb_number",
-        "Agency Owner": "form_agency_owner",
-    }
-    metadata_df = pd.read_csv(metadata_path)
-    metadata_df = metadata_df[metadata_cols.keys()]
-    metadata_df.rename(columns=metadata_cols, inplace=True)
-    metadata_df.drop_duplicates(subset=["form_link"], inplace=True)
-    merged_df = pd.merge(df, metadata_df, on="form_link", how="left")
-
-    return merged_df
+    # Resolve the metadata table (cached per process when given a path) and
+    # join it against the indexed link column
+    metadata_df = resolve_metadata(metadata, link_column="form_dat_url")
+    return df.join(metadata_df, on="form_link", how="left")
 
 
 def process_and_save_dat_files(
-    dat_dir: str, metadata_path: str, output_path: str
+    dat_dir: str,
+    metadata: Union[str, pd.DataFrame],
+    output_path: str,
 ) -> None:
     """
     Process all DAT files, enrich with metadata, and save the result.
 
     Args:
         dat_dir (str): Directory containing DAT files
-        metadata_path (str): Path to FormMetadata.csv
+        metadata (Union[str, pd.DataFrame]): Path to FormMetadata.csv, or an
+            already-loaded frame from metadata.load_metadata
         output_path (str): Path to save the output CSV
     """
     # Process all DAT files
@@ -125,7 +133,7 @@ def process_and_save_dat_files(
         return
 
     # Enrich with metadata
-    df = add_form_metadata(df, metadata_path)
+    df = add_form_metadata(df, metadata)
 
     # Save to CSV
     df.to_csv(output_path, index=False)
@@ -141,6 +149,6 @@ if __name__ == "__main__":
     # Process and save DAT files
     process_and_save_dat_files(
         dat_dir="./tmp/dat",
-        metadata_path="./FormMetadata.csv",
+        metadata="./FormMetadata.csv",
         output_path="./tmp/processed_dat_files.csv",
     )